@@ -1,19 +1,58 @@
 
 
 import os
+import io
 import json
+import math
+import hashlib
+import tempfile
 import webbrowser
 import sys
+import time
+import queue
+import threading
+import concurrent.futures
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import customtkinter as ctk
-from PIL import Image
-from PIL.ExifTags import TAGS, GPSTAGS
+from PIL import Image, ImageTk, ExifTags
+from PIL.ExifTags import GPSTAGS
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 APP_TITLE = "📍 Image Location Finder"
 SAVE_FILE = "history.json"
+GEOCODE_CACHE_FILE = "geocode_cache.json"
+THUMB_DIR = "thumbs"
 HEADER_HEIGHT = 70
+SAVE_DELAY_MS = 500
+PREFETCH_DELAY_MS = 5000
+THUMB_SIZE = (96, 96)
+
+EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+# Separate pool so a backlog of history thumbnails never delays an upload.
+THUMB_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+# One keep-alive session for all Nominatim calls, so only the first lookup
+# pays for the TCP/TLS handshake.
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "ImageLocationFinder/1.0 (desktop app)"})
+# 429 is deliberately not retried here: urllib3's first retry has no backoff,
+# which would break the 1 req/s pacing done by _geocode_worker.
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+))
+GEOCODE_INTERVAL = 1.0  # Nominatim usage policy: at most 1 request per second
+
+PENDING_ADDRESS_TEXT = "Looking up address..."
+ADDRESS_NOT_FOUND_TEXT = "Address not found"
 
 NO_GPS_REASON_TEXT = (
     "No GPS data found because:\n"
@@ -21,60 +60,112 @@ NO_GPS_REASON_TEXT = (
     "2) The camera’s location setting was OFF when the photo was taken."
 )
 
+def _read_json(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. bare NaN written by older json.dump; stdlib accepts it
+    return json.loads(data.decode("utf-8"))
+
 def load_history():
     if os.path.exists(SAVE_FILE):
         try:
-            with open(SAVE_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return _read_json(SAVE_FILE)
         except Exception:
             return []
     return []
 
+def _write_json_atomic(path, data):
+    # Write to a temp file and swap it in, so a crash mid-write can't leave
+    # a truncated file behind.
+    tmp = path + ".tmp"
+    if orjson is not None:
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(data))
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
 def save_history():
-    with open(SAVE_FILE, "w", encoding="utf-8") as f:
-        json.dump(history, f, ensure_ascii=False, indent=2)
+    # keys starting with "_" are runtime-only (e.g. a pre-rendered thumbnail)
+    data = [{k: v for k, v in item.items() if not k.startswith("_")} for item in history]
+    _write_json_atomic(SAVE_FILE, data)
+    save_geocode_cache()
+
+_save_job = None
+
+def schedule_save():
+    # Coalesce a burst of uploads/deletes into a single write.
+    global _save_job
+    if _save_job is not None:
+        root.after_cancel(_save_job)
+    _save_job = root.after(SAVE_DELAY_MS, _do_save)
+
+def _do_save():
+    global _save_job
+    if _save_job is not None:
+        root.after_cancel(_save_job)
+        _save_job = None
+    save_history()
 
-def extract_exif(image_path: str) -> dict:
+def load_geocode_cache():
+    if os.path.exists(GEOCODE_CACHE_FILE):
+        try:
+            return _read_json(GEOCODE_CACHE_FILE)
+        except Exception:
+            return {}
+    return {}
+
+def save_geocode_cache():
+    # copy first: worker threads may add entries while we serialize
+    _write_json_atomic(GEOCODE_CACHE_FILE, dict(_geocode_cache))
+
+def _may_have_exif(head: bytes) -> bool:
+    # JPEG (SOI marker) or RIFF/WEBP container
+    return head.startswith(b"\xff\xd8") or (head[:4] == b"RIFF" and head[8:12] == b"WEBP")
+
+def extract_exif(image_path: str, thumb_size=THUMB_SIZE):
+    # Returns (exif, thumbnail) from a single open of the file, so the history
+    # row doesn't have to open and parse the image a second time.
+    # Only the GPS IFD is read: getexif() parses IFD0 from the already-read
+    # header and get_ifd() follows just the GPSInfo pointer, skipping the Exif
+    # sub-IFD and maker notes that _getexif() would expand.
     try:
+        with open(image_path, "rb") as f:
+            head = f.read(12)
+        if not _may_have_exif(head):
+            return {}, None  # PNG etc.: the thumbnail is rendered later as usual
         image = Image.open(image_path)
-        if not hasattr(image, "_getexif"):
-            return {}
-        raw = image._getexif()
-        if not raw or not isinstance(raw, dict):
-            return {}
-        exif = {}
-        for k, v in raw.items():
-            tag = TAGS.get(k, k)
-            if tag == "GPSInfo" and isinstance(v, dict):
-                gps = {}
-                for sub_k, sub_v in v.items():
-                    gps_tag = GPSTAGS.get(sub_k, sub_k)
-                    gps[gps_tag] = sub_v
-                exif["GPSInfo"] = gps
-            else:
-                exif[tag] = v
-        return exif
     except Exception:
-        return {}
+        return {}, None
 
-def _to_float(x):
-    try:
-        return float(x)
-    except Exception:
+    exif = {}
+    thumb = None
+    with image:
         try:
-            return float(x[0]) / float(x[1])
+            gps_ifd = image.getexif().get_ifd(ExifTags.IFD.GPSInfo)
+            if gps_ifd:
+                exif = {"GPSInfo": {GPSTAGS.get(k, k): v for k, v in gps_ifd.items()}}
         except Exception:
-            return None
+            pass
+
+        try:
+            # copy() so the thumbnail doesn't depend on the file we're closing
+            thumb = _render_thumbnail(image, thumb_size).copy()
+        except Exception:
+            pass
+    return exif, thumb
 
 def convert_to_degrees(value):
+    # Pillow gives IFDRational components, which (like Fraction) support float()
     try:
-        d = _to_float(value[0])
-        m = _to_float(value[1])
-        s = _to_float(value[2])
-        if None in (d, m, s):
-            return None
-        return d + (m / 60.0) + (s / 3600.0)
-    except Exception:
+        d, m, s = value[0], value[1], value[2]
+        return float(d) + float(m) / 60.0 + float(s) / 3600.0
+    except (TypeError, ValueError, IndexError, ZeroDivisionError):
         return None
 
 def get_lat_lon(exif: dict):
@@ -84,6 +175,9 @@ def get_lat_lon(exif: dict):
         lon = convert_to_degrees(gps["GPSLongitude"])
         if lat is None or lon is None:
             return None
+        # 0/0 rationals give nan, which can't round-trip through JSON
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            return None
         if gps.get("GPSLatitudeRef") and gps["GPSLatitudeRef"] != "N":
             lat = -lat
         if gps.get("GPSLongitudeRef") and gps["GPSLongitudeRef"] != "E":
@@ -92,18 +186,33 @@ def get_lat_lon(exif: dict):
     except Exception:
         return None
 
+def _geocode_key(lat, lon) -> str:
+    # 5 decimal places is roughly 1 m, so repeat/nearby shots share an entry
+    return f"{round(lat, 5)},{round(lon, 5)}"
+
 def get_address(lat, lon) -> str:
+    key = _geocode_key(lat, lon)
+    if key in _geocode_cache:
+        return _geocode_cache[key]
+    address = _fetch_address(lat, lon)
+    if address is not None:
+        _geocode_cache[key] = address
+        return address
+    return ADDRESS_NOT_FOUND_TEXT
+
+def _fetch_address(lat, lon):
     try:
         url = "https://nominatim.openstreetmap.org/reverse"
         params = {"format": "json", "lat": lat, "lon": lon}
-        headers = {"User-Agent": "ImageLocationFinder/1.0 (desktop app)"}
-        r = requests.get(url, params=params, headers=headers, timeout=15)
+        r = SESSION.get(url, params=params, timeout=15)
         if r.status_code == 200:
-            data = r.json()
-            return data.get("display_name", "Address not found")
-        return "Address not found"
+            # a 200 without display_name (e.g. {"error": "Unable to geocode"}
+            # for open sea) is a definite miss and safe to cache; None is kept
+            # for transport/HTTP errors so those get retried
+            return r.json().get("display_name") or ADDRESS_NOT_FOUND_TEXT
+        return None
     except Exception:
-        return "Address not found"
+        return None
 
 def open_image_file(path: str):
     try:
@@ -128,7 +237,13 @@ def upload_image():
         status_label.configure(text="No file selected.")
         return
 
-    exif = extract_exif(file_path)
+    status_label.configure(text=f"Processing: {os.path.basename(file_path)}...")
+    future = EXECUTOR.submit(_process, file_path)
+    future.add_done_callback(lambda f: root.after(0, _finish, f.result()))
+
+def _process(file_path: str) -> dict:
+    # Runs on a worker thread: no Tk calls in here.
+    exif, thumb = extract_exif(file_path)
     coords = get_lat_lon(exif)
 
     if not coords:
@@ -138,37 +253,100 @@ def upload_image():
             "path": file_path,
             "reason": NO_GPS_REASON_TEXT
         }
-        history.append(item)
-        save_history()
-        status_label.configure(text=f"Saved (no GPS): {item['name']}")
-        refresh_history()
-        return
+    else:
+        lat, lon = coords
+        item = {
+            "status": "ok",
+            "name": os.path.basename(file_path),
+            "path": file_path,
+            "lat": lat,
+            "lon": lon,
+            # None until the geocode worker fills it in (unless already cached)
+            "address": _geocode_cache.get(_geocode_key(lat, lon))
+        }
+    if thumb is not None:
+        item["_thumb"] = thumb
+    return item
 
-    lat, lon = coords
-    address = get_address(lat, lon)
-
-    item = {
-        "status": "ok",
-        "name": os.path.basename(file_path),
-        "path": file_path,
-        "lat": lat,
-        "lon": lon,
-        "address": address
-    }
+def _finish(item: dict):
     history.append(item)
-    save_history()
-    status_label.configure(text=f"Saved: {item['name']}")
-    refresh_history()
+    schedule_save()
+    if item["status"] == "ok":
+        status_label.configure(text=f"Saved: {item['name']}")
+    else:
+        status_label.configure(text=f"Saved (no GPS): {item['name']}")
+    add_row(item)
+    if item["status"] == "ok" and item["address"] is None:
+        _geocode_queue.put(item)
+
+_geocode_queue = queue.Queue()
+
+def _geocode_worker():
+    # Single consumer so lookups are serialized under Nominatim's rate limit;
+    # cache hits don't count against it.
+    while True:
+        item = _geocode_queue.get()
+        try:
+            key = _geocode_key(item["lat"], item["lon"])
+            cached = key in _geocode_cache
+            address = get_address(item["lat"], item["lon"])
+            # a new cache entry (hit or definite miss) must be persisted even
+            # if the item's text doesn't change
+            root.after(0, _update_row, item, address, not cached and key in _geocode_cache)
+            if not cached:
+                time.sleep(GEOCODE_INTERVAL)
+        except Exception:
+            # one bad item (hand-edited lat/lon, Tk loop gone) mustn't kill
+            # the only worker and stall every later lookup
+            continue
+
+def _seed_geocode_cache():
+    # Addresses already stored in the history are as good as a lookup.
+    for item in history:
+        addr = item.get("address")
+        if item.get("status") == "ok" and addr and addr != ADDRESS_NOT_FOUND_TEXT:
+            _geocode_cache.setdefault(_geocode_key(item["lat"], item["lon"]), addr)
+
+def _prefetch_addresses():
+    # Items saved before their lookup finished (e.g. app closed early) or
+    # whose lookup failed transiently (offline, retries exhausted). Definite
+    # misses are in the geocode cache, so those aren't asked again.
+    for item in history:
+        if item.get("status") != "ok":
+            continue
+        address = item.get("address")
+        if address is None or (address == ADDRESS_NOT_FOUND_TEXT
+                               and _geocode_key(item["lat"], item["lon"]) not in _geocode_cache):
+            _geocode_queue.put(item)
+
+def _update_row(item, address, cache_changed=False):
+    changed = item.get("address") != address
+    item["address"] = address
+    if cache_changed:
+        schedule_save()
+    idx = _history_index(item)
+    if idx < 0:
+        return  # deleted while the lookup was in flight
+    if changed:
+        _rows[idx].refresh_details()
+        schedule_save()
+
+def _history_index(item) -> int:
+    # identity, not ==: the same photo uploaded twice gives equal dicts
+    for idx, it in enumerate(history):
+        if it is item:
+            return idx
+    return -1
 
 def delete_entry(item):
     if messagebox.askyesno("Confirm Delete", f"Delete '{item['name']}' from history?"):
-        try:
-            history.remove(item)
-            save_history()
-            refresh_history()
-            status_label.configure(text=f"Deleted: {item['name']}")
-        except ValueError:
-            pass
+        idx = _history_index(item)
+        if idx < 0:
+            return
+        del history[idx]
+        schedule_save()
+        remove_row(idx)
+        status_label.configure(text=f"Deleted: {item['name']}")
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
@@ -184,22 +362,40 @@ header_container.pack(fill="x", pady=(0, 8))
 canvas = tk.Canvas(header_container, height=HEADER_HEIGHT, highlightthickness=0, bd=0)
 canvas.pack(fill="x")
 
+GRADIENT_START = (0, 201, 167)
+GRADIENT_END = (132, 94, 194)
+
+_gradient_image = None
+_gradient_job = None
+
 def draw_gradient():
+    global _gradient_image, _gradient_job
+    _gradient_job = None
     canvas_width = canvas.winfo_width() or 860
     canvas.delete("grad")
-    for x in range(canvas_width):
-        r = int(0 + (132 - 0) * (x / max(1, canvas_width)))
-        g = int(201 + (94 - 201) * (x / max(1, canvas_width)))
-        b = int(167 + (194 - 167) * (x / max(1, canvas_width)))
-        color = f"#{r:02x}{g:02x}{b:02x}"
-        canvas.create_line(x, 0, x, HEADER_HEIGHT, fill=color, tags="grad")
+    # Interpolate each channel from a 0..255 ramp in C (Image.point) and blit
+    # once, rather than creating one canvas line per pixel column.
+    ramp = Image.linear_gradient("L").transpose(Image.Transpose.ROTATE_90).resize((canvas_width, HEADER_HEIGHT))
+    channels = [
+        ramp.point(lambda v, a=a, b=b: a + (b - a) * v // 255)
+        for a, b in zip(GRADIENT_START, GRADIENT_END)
+    ]
+    _gradient_image = ImageTk.PhotoImage(Image.merge("RGB", channels))
+    canvas.create_image(0, 0, anchor="nw", image=_gradient_image, tags="grad")
     canvas.create_text(
         canvas_width // 2, HEADER_HEIGHT // 2,
         text=APP_TITLE, fill="white",
         font=("Segoe UI", 20, "bold"), tags="grad"
     )
 
-canvas.bind("<Configure>", lambda e: draw_gradient())
+def schedule_gradient(_event=None):
+    # coalesce the burst of <Configure> events from a resize drag
+    global _gradient_job
+    if _gradient_job is not None:
+        root.after_cancel(_gradient_job)
+    _gradient_job = root.after(50, draw_gradient)
+
+canvas.bind("<Configure>", schedule_gradient)
 root.after(50, draw_gradient)
 
 top_box = ctk.CTkFrame(root, fg_color="#1f2233", corner_radius=12)
@@ -231,77 +427,267 @@ status_label.pack(fill="x", padx=16, pady=(0, 8))
 history_frame = ctk.CTkScrollableFrame(root, width=900, height=600, corner_radius=12, fg_color="#131624")
 history_frame.pack(padx=12, pady=6, fill="both", expand=True)
 
-_thumbnail_refs = {}
-
-def make_thumbnail(img_path, max_size=(96, 96)):
+# HistoryRow objects, kept parallel to `history`.
+_rows = []
+# Rows removed from the list are parked here and reused by add_row, since
+# building a row's CustomTkinter widgets is the expensive part.
+_row_pool = []
+_empty_label = None
+
+def _embedded_thumbnail(im, max_size):
+    # JPEG EXIF usually carries a small preview in IFD1; decoding those few KB
+    # is much cheaper than decoding the full-resolution photo.
+    raw = im.info.get("exif")
+    if not raw:
+        return None
     try:
-        im = Image.open(img_path)
-        im.thumbnail(max_size)
-        return ctk.CTkImage(light_image=im, dark_image=im, size=im.size)
+        ifd1 = im.getexif().get_ifd(ExifTags.IFD.IFD1)
+        offset = ifd1.get(0x0201)  # JPEGInterchangeFormat
+        length = ifd1.get(0x0202)  # JPEGInterchangeFormatLength
+        if not offset or not length:
+            return None
+        start = offset + 6  # offsets are relative to the TIFF header after b"Exif\0\0"
+        thumb = Image.open(io.BytesIO(raw[start:start + length]))
+        if thumb.width < max_size[0] and thumb.height < max_size[1]:
+            return None
+        # some cameras letterbox the preview; fall back if the shape is off
+        if abs(thumb.width / thumb.height - im.width / im.height) > 0.05:
+            return None
+        return thumb
     except Exception:
-        from PIL import Image as PILImage
-        placeholder = PILImage.new("RGB", max_size, (60, 60, 60))
-        return ctk.CTkImage(light_image=placeholder, dark_image=placeholder, size=max_size)
-
-def refresh_history():
-    for w in history_frame.winfo_children():
-        w.destroy()
-
-    if not history:
-        empty = ctk.CTkLabel(history_frame, text="No saved items yet. Upload an image to get started.", text_color="#7c818c")
-        empty.pack(pady=16)
-        return
+        return None
 
-    for idx, item in enumerate(history):
-        row = ctk.CTkFrame(history_frame, corner_radius=12, fg_color="#1b1f30")
-        row.pack(fill="x", padx=8, pady=8)
+def _render_thumbnail(im, max_size):
+    thumb = _embedded_thumbnail(im, max_size)
+    if thumb is None:
+        # let libjpeg scale by 1/2..1/8 while decoding (no-op for other formats)
+        im.draft("RGB", (max_size[0] * 2, max_size[1] * 2))
+        thumb = im
+    thumb.thumbnail(max_size, Image.Resampling.BILINEAR)
+    if thumb.mode not in ("RGB", "RGBA", "L"):
+        # keep transparency (P/LA/PA icons); flatten the rest, e.g. CMYK JPEGs
+        if "A" in thumb.getbands() or "transparency" in thumb.info:
+            thumb = thumb.convert("RGBA")
+        else:
+            thumb = thumb.convert("RGB")
+    return thumb
+
+def _thumb_cache_path(img_path, max_size):
+    key = hashlib.sha1(f"{img_path}|{os.path.getmtime(img_path)}|{max_size}".encode("utf-8")).hexdigest()
+    return os.path.join(THUMB_DIR, key + ".png")
+
+def load_thumbnail(img_path, im=None, max_size=THUMB_SIZE):
+    # Returns a decoded PIL image and touches neither Tk state nor history
+    # items, so it is safe to run on THUMB_EXECUTOR; the CTkImage is built
+    # back on the Tk thread. `im` is a thumbnail already rendered by
+    # extract_exif.
+    try:
+        cache_path = _thumb_cache_path(img_path, max_size)
+        cached = os.path.exists(cache_path)
+        # copy() inside the with-blocks: decoded pixels, file closed on exit
+        if im is None and cached:
+            try:
+                with Image.open(cache_path) as src:
+                    return src.copy()
+            except Exception:
+                cached = False  # corrupt/truncated entry: re-render and rewrite it
+        if im is None:
+            with Image.open(img_path) as src:
+                im = _render_thumbnail(src, max_size).copy()
+        if not cached:
+            _save_thumb_cache(im, cache_path)
+        return im
+    except Exception:
+        return Image.new("RGB", max_size, (60, 60, 60))
 
-        thumb = make_thumbnail(item["path"])
-        _thumbnail_refs[idx] = thumb
-        img_btn = ctk.CTkButton(
-            row, image=thumb, text="",
+def _save_thumb_cache(im, cache_path):
+    # Per-call temp file swapped in with os.replace (as in _write_json_atomic),
+    # so concurrent loads of the same photo never open a half-written PNG and
+    # a crash can't leave a truncated one at the final name.
+    tmp = None
+    try:
+        os.makedirs(THUMB_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=THUMB_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            im.save(f, "PNG", optimize=True)
+        os.replace(tmp, cache_path)
+    except Exception:
+        if tmp is not None and os.path.exists(tmp):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+_placeholder_thumb = None
+
+def _placeholder_thumbnail():
+    global _placeholder_thumb
+    if _placeholder_thumb is None:
+        im = Image.new("RGB", THUMB_SIZE, (60, 60, 60))
+        _placeholder_thumb = ctk.CTkImage(light_image=im, dark_image=im, size=THUMB_SIZE)
+    return _placeholder_thumb
+
+def _post_thumbnail(future, row, item):
+    # Runs on the worker thread that finished the future.
+    if not future.cancelled() and future.exception() is None:
+        root.after(0, row.set_thumbnail, item, future.result())
+
+def _show_empty_label():
+    global _empty_label
+    if _empty_label is None:
+        _empty_label = ctk.CTkLabel(history_frame, text="No saved items yet. Upload an image to get started.", text_color="#7c818c")
+        _empty_label.pack(pady=16)
+
+def _hide_empty_label():
+    global _empty_label
+    if _empty_label is not None:
+        _empty_label.destroy()
+        _empty_label = None
+
+def _details_text(item) -> str:
+    if item.get("status") == "ok":
+        addr = item.get("address", ADDRESS_NOT_FOUND_TEXT)
+        if addr is None:
+            addr = PENDING_ADDRESS_TEXT
+        return f"{addr}\nLat: {round(item['lat'], 6)}   Lon: {round(item['lon'], 6)}"
+    return item.get("reason", NO_GPS_REASON_TEXT)
+
+class HistoryRow:
+    # Widget commands are bound methods reading self.item, so releasing a row
+    # drops its only reference to the history entry.
+
+    def __init__(self, parent):
+        self.item = None
+        self.thumb = _placeholder_thumbnail()
+        self.frame = ctk.CTkFrame(parent, corner_radius=12, fg_color="#1b1f30")
+
+        self.img_btn = ctk.CTkButton(
+            self.frame, image=self.thumb, text="",
             width=100, height=100,
             fg_color="transparent", hover_color="#232844",
-            command=lambda p=item["path"]: open_image_file(p)
+            command=self.on_open
         )
-        img_btn.grid(row=0, column=0, rowspan=4, padx=10, pady=10)
-
-        name_lbl = ctk.CTkLabel(row, text=item["name"], font=ctk.CTkFont(size=14, weight="bold"))
-        name_lbl.grid(row=0, column=1, sticky="w", padx=6, pady=(10, 2))
+        self.img_btn.grid(row=0, column=0, rowspan=4, padx=10, pady=10)
 
-        path_lbl = ctk.CTkLabel(row, text=item["path"], text_color="#9aa0a6",
-                                font=ctk.CTkFont(size=11), wraplength=740, justify="left")
-        path_lbl.grid(row=1, column=1, sticky="w", padx=6)
+        self.name_lbl = ctk.CTkLabel(self.frame, text="", font=ctk.CTkFont(size=14, weight="bold"))
+        self.name_lbl.grid(row=0, column=1, sticky="w", padx=6, pady=(10, 2))
 
-        if item.get("status") == "ok":
-            addr = item.get("address", "Address not found")
-            details_text = f"{addr}\nLat: {round(item['lat'], 6)}   Lon: {round(item['lon'], 6)}"
-        else:
-            details_text = item.get("reason", NO_GPS_REASON_TEXT)
+        self.path_lbl = ctk.CTkLabel(self.frame, text="", text_color="#9aa0a6",
+                                     font=ctk.CTkFont(size=11), wraplength=740, justify="left")
+        self.path_lbl.grid(row=1, column=1, sticky="w", padx=6)
 
-        details_lbl = ctk.CTkLabel(row, text=details_text, wraplength=740, justify="left")
-        details_lbl.grid(row=2, column=1, sticky="w", padx=6, pady=(2, 10))
+        self.details_lbl = ctk.CTkLabel(self.frame, text="", wraplength=740, justify="left")
+        self.details_lbl.grid(row=2, column=1, sticky="w", padx=6, pady=(2, 10))
 
-        btns = ctk.CTkFrame(row, fg_color="transparent")
+        btns = ctk.CTkFrame(self.frame, fg_color="transparent")
         btns.grid(row=0, column=2, rowspan=4, padx=8, pady=8, sticky="e")
 
-        if item.get("status") == "ok":
-            maps_btn = ctk.CTkButton(
-                btns, text="Open in Google Maps",
-                fg_color="#3B82F6", hover_color="#2563EB",
-                command=lambda lt=item["lat"], ln=item["lon"]: open_in_maps(lt, ln)
-            )
-            maps_btn.pack(padx=6, pady=(8, 6), fill="x")
-
-        del_btn = ctk.CTkButton(
+        # packed/unpacked per item in bind()
+        self.maps_btn = ctk.CTkButton(
+            btns, text="Open in Google Maps",
+            fg_color="#3B82F6", hover_color="#2563EB",
+            command=self.on_maps
+        )
+
+        self.del_btn = ctk.CTkButton(
             btns, text="❌ Delete",
             fg_color="#DC2626", hover_color="#B91C1C",
-            command=lambda it=item: delete_entry(it)
+            command=self.on_delete
         )
-        del_btn.pack(padx=6, pady=(0, 8), fill="x")
+        self.del_btn.pack(padx=6, pady=(0, 8), fill="x")
+
+        self.frame.grid_columnconfigure(1, weight=1)
 
-        row.grid_columnconfigure(1, weight=1)
+    def bind(self, item):
+        self.item = item
+        # Show a grey tile now and decode the real thumbnail off the Tk thread.
+        self.thumb = _placeholder_thumbnail()
+        self.img_btn.configure(image=self.thumb)
+        # pop here on the Tk thread: save_history may be iterating this dict
+        future = THUMB_EXECUTOR.submit(load_thumbnail, item["path"], item.pop("_thumb", None))
+        future.add_done_callback(lambda f, it=item: _post_thumbnail(f, self, it))
+
+        self.name_lbl.configure(text=item["name"])
+        self.path_lbl.configure(text=item["path"])
+        self.refresh_details()
+
+        if item.get("status") == "ok":
+            self.maps_btn.pack(padx=6, pady=(8, 6), fill="x", before=self.del_btn)
+        else:
+            self.maps_btn.pack_forget()
+
+        self.frame.pack(fill="x", padx=8, pady=8)
+
+    def release(self):
+        self.item = None
+        self.thumb = _placeholder_thumbnail()
+        self.img_btn.configure(image=self.thumb)
+        self.frame.pack_forget()
+
+    def refresh_details(self):
+        self.details_lbl.configure(text=_details_text(self.item))
+
+    def set_thumbnail(self, item, im):
+        if self.item is not item:
+            return  # row was released/reused before its thumbnail finished
+        self.thumb = ctk.CTkImage(light_image=im, dark_image=im, size=im.size)
+        self.img_btn.configure(image=self.thumb)
+
+    def on_open(self):
+        open_image_file(self.item["path"])
+
+    def on_maps(self):
+        open_in_maps(self.item["lat"], self.item["lon"])
+
+    def on_delete(self):
+        delete_entry(self.item)
+
+def add_row(item):
+    _hide_empty_label()
+    row = _row_pool.pop() if _row_pool else HistoryRow(history_frame)
+    row.bind(item)
+    _rows.append(row)
+
+def remove_row(idx):
+    row = _rows.pop(idx)
+    row.release()
+    _row_pool.append(row)
+    if not history:
+        _show_empty_label()
+
+def refresh_history():
+    global _empty_label
+    for w in history_frame.winfo_children():
+        w.destroy()
+    _rows.clear()
+    _row_pool.clear()
+    _empty_label = None
+
+    if not history:
+        _show_empty_label()
+        return
+
+    for item in history:
+        add_row(item)
 
 history = load_history()
+_geocode_cache = load_geocode_cache()
+_seed_geocode_cache()
 refresh_history()
+threading.Thread(target=_geocode_worker, daemon=True).start()
+root.after(PREFETCH_DELAY_MS, _prefetch_addresses)
+
+def on_close():
+    # Only flush pending changes: rewriting on every close could replace a
+    # history file that failed to load with [].
+    # A failed write (read-only dir, full disk) must not keep the window open.
+    try:
+        if _save_job is not None:
+            _do_save()
+    finally:
+        EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        THUMB_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", on_close)
 root.mainloop()